@@ -67,7 +67,7 @@ if "bpy" in locals():
     from importlib import reload
     
     # Our own libraries
-    libs = [updateChecker, rename]
+    libs = [releaseCheck, updateChecker, templates, matching, renameMap, references, regexGuard, hooks, conflicts, rename]
     
     for lib in libs:        
         try:
@@ -78,7 +78,15 @@ if "bpy" in locals():
     del reload
 
 import bpy
+from . import releaseCheck
 from . import updateChecker
+from . import templates
+from . import matching
+from . import renameMap
+from . import references
+from . import regexGuard
+from . import hooks
+from . import conflicts
 from . import rename
 
 
@@ -0,0 +1,341 @@
+# T1nk-R's Unified Rename add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module is responsible for detecting and resolving name conflicts before renaming.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to get a single panel to batch rename collections and objects shown in Blender's Outliner
+# using text or regex-based search and replace.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to change the name of your Blender objects and collections matching the criteria you specify.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way.
+#   * You shall be able to simply undo consequences made by this add-on.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# *********************************************************************************************************************************
+
+from __future__ import annotations
+import re
+import bpy
+
+from . import renameMap
+
+# Conflict resolver ###############################################################################################################
+class ConflictResolver:
+    """
+    Detects renames which would lead to a name already taken within the same type of IDs, either because several items
+    would get the same name, or because an item not renamed already has it. Without this, Blender would silently add
+    a numeric suffix such as `.001`. Conflicts are resolved as specified by the policy before any name is changed.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    _dataCollections = {
+        'OBJECT': "objects",
+        'COLLECTION': "collections"
+    }
+    """
+    Attributes of `bpy.data` listing IDs of each type.
+    """
+    
+    _suffixPattern = re.compile(r"^(.*?)(?:\.(\d{3,}))?$", re.DOTALL)
+    """
+    Splits a name to a base name and Blender's numeric suffix, if any.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    
+    # Initialize object -----------------------------------------------------------------------------------------------------------
+    def __init__(self, policy: str):
+        """
+        Make a resolver.
+
+        Args:
+            policy (str): What to do with conflicts: `ABORT` to raise an exception, `AUTO_SUFFIX` to add a numeric suffix
+                (like Blender would), or `SKIP` to leave conflicting items unchanged.
+        """
+        
+        self.policy = policy
+        """
+        What to do with conflicts: `ABORT`, `AUTO_SUFFIX` or `SKIP`.
+        """
+        
+        self.conflicts: list[str] = []
+        """
+        Descriptions of the conflicts found, along with how they were resolved.
+        """
+        
+        self._names: dict[str, set] = {}
+        """
+        Names of local IDs by type, built once per run for types being renamed.
+        """
+        
+        self._nextSuffix: dict[tuple, int] = {}
+        """
+        Next numeric suffix to try for a (type, base name) pair when adding suffixes.
+        """
+        
+        self._skipReasons: dict[int, str] = {}
+        """
+        Descriptions of conflicts by the indexes of the items skipped because of them.
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Resolve conflicts -----------------------------------------------------------------------------------------------------------
+    def resolve(self, plan: list[tuple]) -> list[tuple]:
+        """
+        Check the planned renames for conflicts and resolve them as specified by the policy. Each name is checked
+        against an index of names, so this takes time proportional to the number of items.
+
+        Args:
+            plan (list[tuple]): The items to rename and their new names as tuples.
+
+        Returns:
+            The resolved plan, in which new names are unique within each type.
+
+        Raises:
+            Exception: If conflicts are found and the policy is `ABORT`.
+        """
+        
+        types = [renameMap.RenameMap.keyOf(item)[0] for item, _ in plan]
+        
+        for idType in set(types):
+            if idType not in self._names:
+                self._names[idType] = set(i.name for i in getattr(bpy.data, self._dataCollections[idType]) if i.library is None)
+        
+        self.conflicts = []
+        self._nextSuffix = {}
+        self._skipReasons = {}
+        
+        # Names freed up by items being renamed
+        freed = set((idType, item.name) for (item, _), idType in zip(plan, types))
+        
+        newNames, claimed = self._resolve(plan, types, freed)
+        
+        # Skipped items keep their old names, which may cause further skips
+        if self.policy == 'SKIP':
+            self._spreadSkips(plan, types, freed, newNames, claimed)
+        
+        resolved = []
+        
+        for i, (item, _) in enumerate(plan):
+            if i in self._skipReasons:
+                self.conflicts.append(self._skipReasons[i])
+            elif newNames[i] is not None:
+                resolved.append((item, newNames[i]))
+        
+        if len(self.conflicts) > 0 and self.policy == 'ABORT':
+            raise Exception(f"{len(self.conflicts)} name conflict(s) found, nothing has been renamed. See the System " + \
+                "Console for details, or choose another conflict policy.")
+        
+        return resolved
+    
+    # Order renames ---------------------------------------------------------------------------------------------------------------
+    def applyOrder(self, plan: list[tuple]) -> list[tuple]:
+        """
+        Order a resolved plan so that no item gets a name still held by another item, which Blender would resolve by
+        adding a suffix. In chains like `A` to `B` and `B` to `C`, `B` is renamed first. In cycles like swapping `A` and 
+        `B`, one of the items is first given a temporary name.
+
+        Args:
+            plan (list[tuple]): The resolved plan as returned by `resolve`.
+
+        Returns:
+            The renames in the order to perform them, as (item, new name, is temporary) tuples.
+        """
+        
+        types = [renameMap.RenameMap.keyOf(item)[0] for item, _ in plan]
+        holders = {(idType, item.name): i for i, ((item, _), idType) in enumerate(zip(plan, types))}
+        
+        # Temporary names shall not take any of the new names
+        claimed = {(idType, newName): item.name for (item, newName), idType in zip(plan, types)}
+        
+        isDone = [False] * len(plan)
+        ordered = []
+        
+        for start in range(len(plan)):
+            # Follow the chain of items holding the new name of the previous one
+            path = []
+            onPath = set()
+            i = start
+            while i is not None and not isDone[i] and i not in onPath:
+                path.append(i)
+                onPath.add(i)
+                item, newName = plan[i]
+                i = holders.get((types[i], newName))
+            
+            isCycle = i == start and len(path) > 1
+            
+            if isCycle:
+                # Free up the name of the first item so that the last one in the cycle can take it
+                item, newName = plan[start]
+                ordered.append((item, self._uniqueName(types[start], newName, claimed), True))
+                path = path[1:]
+            
+            for i in reversed(path):
+                item, newName = plan[i]
+                ordered.append((item, newName, False))
+                isDone[i] = True
+            
+            if isCycle:
+                item, newName = plan[start]
+                ordered.append((item, newName, False))
+                isDone[start] = True
+        
+        return ordered
+    
+    # Perform renames -------------------------------------------------------------------------------------------------------------
+    def rename(self, plan: list[tuple], onRenamed):
+        """
+        Rename the items of a resolved plan in the order determined by `applyOrder`, using temporary names to break
+        cycles.
+
+        Args:
+            plan (list[tuple]): The resolved plan as returned by `resolve`.
+            onRenamed: A function called with the item and its original name after the item got its final name.
+        """
+        
+        # Items given a temporary name first, mapped to their original names
+        originalNames = {}
+        
+        for item, newName, isTemporary in self.applyOrder(plan):
+            oldName = originalNames.get(item, item.name)
+            item.name = newName
+            
+            if isTemporary:
+                originalNames[item] = oldName
+            else:
+                onRenamed(item, oldName)
+    
+    # Private functions ===========================================================================================================
+    
+    # Resolve conflicts in one pass -----------------------------------------------------------------------------------------------
+    def _resolve(self, plan: list[tuple], types: list[str], freed: set) -> tuple:
+        """
+        Resolve conflicts assuming all items are renamed. Items skipped are recorded in `_skipReasons`.
+
+        Returns:
+            A tuple of the new names by item index (`None` for items not renamed), and the new names taken mapped to the
+            index of the item taking them.
+        """
+        
+        # New names taken by items already processed, mapped to the item's index
+        claimed: dict[tuple, int] = {}
+        
+        newNames = []
+        
+        for i, ((item, newName), idType) in enumerate(zip(plan, types)):
+            key = (idType, newName)
+            typeName = idType.lower()
+            
+            if key in claimed:
+                problem = f"'{item.name}' and '{plan[claimed[key]][0].name}' would both be renamed to '{newName}'"
+            elif newName in self._names[idType] and key not in freed:
+                problem = f"'{item.name}' would be renamed to '{newName}', which is the name of another {typeName}"
+            else:
+                claimed[key] = i
+                newNames.append(newName)
+                continue
+            
+            if self.policy == 'AUTO_SUFFIX':
+                newName = self._uniqueName(idType, newName, claimed, freed)
+                claimed[(idType, newName)] = i
+                newNames.append(newName)
+                self.conflicts.append(f"{typeName.capitalize()} {problem}, renaming to '{newName}' instead")
+            elif self.policy == 'SKIP':
+                newNames.append(None)
+                self._skipReasons[i] = f"{typeName.capitalize()} {problem}, leaving '{item.name}' unchanged"
+            else:
+                newNames.append(None)
+                self.conflicts.append(f"{typeName.capitalize()} {problem}")
+        
+        return newNames, claimed
+    
+    # Spread skips ----------------------------------------------------------------------------------------------------------------
+    def _spreadSkips(self, plan: list[tuple], types: list[str], freed: set, newNames: list, claimed: dict[tuple, int]):
+        """
+        Skip items whose new name is no longer freed up because the item holding it is skipped, and so on along chains
+        of renames. Each skipped item affects at most the one item taking its name, so each item is checked once.
+        """
+        
+        pending = list(self._skipReasons)
+        
+        while len(pending) > 0:
+            j = pending.pop()
+            skippedItem, _ = plan[j]
+            idType = types[j]
+            key = (idType, skippedItem.name)
+            
+            freed.discard(key)
+            
+            # Only the item taking the name (if any) is affected
+            i = claimed.get(key)
+            if i is None or i in self._skipReasons or skippedItem.name not in self._names[idType]:
+                continue
+            
+            item, newName = plan[i]
+            typeName = idType.lower()
+            self._skipReasons[i] = f"{typeName.capitalize()} '{item.name}' would be renamed to '{newName}', which is " + \
+                f"the name of another {typeName}, leaving '{item.name}' unchanged"
+            newNames[i] = None
+            del claimed[(idType, newName)]
+            pending.append(i)
+    
+    # Make a unique name ----------------------------------------------------------------------------------------------------------
+    def _uniqueName(self, idType: str, name: str, claimed: dict = None, freed: set = None) -> str:
+        """
+        Get a name not used by any ID of the type, nor claimed by other renames, by adding a numeric suffix like Blender 
+        would, such as `.001`.
+        """
+        
+        base = self._suffixPattern.match(name)[1]
+        n = self._nextSuffix.get((idType, base), 1)
+        
+        while True:
+            candidate = f"{base}.{n:03}"
+            n = n + 1
+            
+            isTaken = candidate in self._names[idType] and (freed is None or (idType, candidate) not in freed)
+            isTaken = isTaken or (claimed is not None and (idType, candidate) in claimed)
+            
+            if not isTaken:
+                break
+        
+        self._nextSuffix[(idType, base)] = n
+        
+        return candidate
@@ -0,0 +1,175 @@
+# T1nk-R's Unified Rename add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module is responsible for notifying scripts about renames.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to get a single panel to batch rename collections and objects shown in Blender's Outliner
+# using text or regex-based search and replace.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to change the name of your Blender objects and collections matching the criteria you specify.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way.
+#   * You shall be able to simply undo consequences made by this add-on.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# *********************************************************************************************************************************
+
+from __future__ import annotations
+import traceback
+import bpy
+
+from . import renameMap
+
+# Rename event ####################################################################################################################
+class RenameEvent:
+    """
+    Information about a rename operation, passed on to handlers once per operation.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    
+    # Initialize object -----------------------------------------------------------------------------------------------------------
+    def __init__(self, renames: renameMap.RenameMap, mode: str, isTestOnly: bool, started: str, isComplete: bool = True):
+        """
+        Make an event.
+
+        Args:
+            renames (renameMap.RenameMap): The renames performed (or in test mode, planned).
+            mode (str): The mode of the operation, `FIND_REPLACE` or `APPLY_MAP`.
+            isTestOnly (bool): `True` if the operation ran in test mode, so nothing was actually renamed.
+            started (str): Date and time when the operation started.
+            isComplete (bool): `False` if the operation was cancelled due to an error after renaming some items.
+        """
+        
+        self.renames = renames
+        """
+        The renames performed (or in test mode, planned).
+        """
+        
+        self.mode = mode
+        """
+        The mode of the operation, `FIND_REPLACE` or `APPLY_MAP`.
+        """
+        
+        self.isTestOnly = isTestOnly
+        """
+        `True` if the operation ran in test mode, so nothing was actually renamed.
+        """
+        
+        self.started = started
+        """
+        Date and time when the operation started.
+        """
+        
+        self.isComplete = isComplete
+        """
+        `False` if the operation was cancelled due to an error after renaming some items.
+        """
+        
+        self.filePath = bpy.data.filepath
+        """
+        Path of the Blender file the operation ran on, empty if the file has not been saved yet.
+        """
+
+# Handler registration ############################################################################################################
+
+_postRenameHandlers: list = []
+"""
+Functions to call after items are renamed.
+"""
+
+# Register a post-rename handler --------------------------------------------------------------------------------------------------
+def addPostRenameHandler(callback):
+    """
+    Register a function to call with a `RenameEvent` listing the renames performed, once per operation. The function is 
+    called after the operation has completed (in background mode, right at its end), and exceptions it raises are 
+    printed and ignored.
+
+    Args:
+        callback: A function accepting a `RenameEvent`.
+    """
+    
+    if callback not in _postRenameHandlers:
+        _postRenameHandlers.append(callback)
+
+# Unregister a handler ------------------------------------------------------------------------------------------------------------
+def removeHandler(callback):
+    """
+    Unregister a function registered as a post-rename handler.
+
+    Args:
+        callback: The function to unregister.
+    """
+    
+    if callback in _postRenameHandlers:
+        _postRenameHandlers.remove(callback)
+
+# Notification ####################################################################################################################
+
+# Notify about performed renames --------------------------------------------------------------------------------------------------
+def notifyPostRename(event: RenameEvent):
+    """
+    Schedule calling post-rename handlers with the event after the current operation has completed, so that handlers
+    cannot delay or break the operation. In background mode there is no event loop to schedule the call on, so handlers 
+    are called right away.
+    """
+    
+    if len(_postRenameHandlers) == 0:
+        return
+    
+    handlers = list(_postRenameHandlers)
+    
+    if bpy.app.background:
+        _callHandlers(handlers, event)
+        return
+    
+    # Return None from the timer function so that it runs only once
+    bpy.app.timers.register(lambda: _callHandlers(handlers, event), first_interval=0)
+
+# Call handlers -------------------------------------------------------------------------------------------------------------------
+def _callHandlers(handlers: list, event: RenameEvent):
+    """
+    Call each handler with the event, printing and ignoring exceptions, so that a broken handler does not prevent
+    others from running.
+    """
+    
+    for handler in handlers:
+        try:
+            handler(event)
+        except Exception:
+            print(f"Error in rename handler {getattr(handler, '__qualname__', handler)}:")
+            traceback.print_exc()
@@ -0,0 +1,192 @@
+# T1nk-R's Unified Rename add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module is responsible for matching and replacing text in names.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to get a single panel to batch rename collections and objects shown in Blender's Outliner
+# using text or regex-based search and replace.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to change the name of your Blender objects and collections matching the criteria you specify.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way.
+#   * You shall be able to simply undo consequences made by this add-on.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# *********************************************************************************************************************************
+
+from __future__ import annotations
+import re
+import unicodedata
+
+# Name matcher ####################################################################################################################
+class NameMatcher:
+    """
+    Matches the search term against names and performs the replacement, honoring the matching options. The search term
+    is compiled once per run, and normalized names are cached so that each name is normalized only once.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    _wordBoundaryBefore = r"(?<![^\W_])"
+    """
+    Lookbehind for a word boundary. Unlike `\\b`, underscores count as separators, as they usually do in names.
+    """
+    
+    _wordBoundaryAfter = r"(?![^\W_])"
+    """
+    Lookahead for a word boundary. Unlike `\\b`, underscores count as separators, as they usually do in names.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    
+    # Initialize object -----------------------------------------------------------------------------------------------------------
+    def __init__(self, findWhat: str, isRegex: bool, ignoreCase: bool = False, wholeWord: bool = False, 
+                 normalization: str = 'NONE'):
+        """
+        Prepare the search term for matching.
+
+        Args:
+            findWhat (str): The text to find or regular expression to match.
+            isRegex (bool): `True` if `findWhat` is a regular expression.
+            ignoreCase (bool): `True` to match regardless of letter case.
+            wholeWord (bool): `True` to match only whole words.
+            normalization (str): Unicode normalization form applied to both the names and the search term, 
+                `NONE`, `NFC` or `NFKC`.
+
+        Raises:
+            Exception: If `findWhat` is an invalid regular expression.
+        """
+        
+        self.isRegex = isRegex
+        """
+        Tells if the replacement is interpreted as a regex replacement (with backreferences).
+        """
+        
+        self.normalization = normalization if normalization != 'NONE' else None
+        """
+        The Unicode normalization form to use, or `None` if names shall be used as they are.
+        """
+        
+        self._normalized: dict = {}
+        """
+        Cache of normalized names for the run.
+        """
+        
+        self.findWhat = self.normalize(findWhat)
+        """
+        The (normalized) search term.
+        """
+        
+        self.pattern: re.Pattern = None
+        """
+        The compiled search term, or `None` if plain text replacement can be done with `str.replace`.
+        """
+        
+        if isRegex or ignoreCase or wholeWord:
+            expression = self.findWhat if isRegex else re.escape(self.findWhat)
+            
+            if wholeWord:
+                expression = f"{self._wordBoundaryBefore}(?:{expression}){self._wordBoundaryAfter}"
+            
+            try:
+                self.pattern = re.compile(expression, re.IGNORECASE if ignoreCase else 0)
+            except re.error as ex:
+                raise Exception(f"Invalid regular expression '{findWhat}': {ex}")
+    
+    # Public functions ============================================================================================================
+    
+    # Normalize a name ------------------------------------------------------------------------------------------------------------
+    def normalize(self, name: str) -> str:
+        """
+        Get the name in the selected Unicode normalization form. Results are cached for the run.
+
+        Args:
+            name (str): The name to normalize.
+
+        Returns:
+            The normalized name, or the name itself if no normalization is selected.
+        """
+        
+        if self.normalization is None:
+            return name
+        
+        normalized = self._normalized.get(name)
+        
+        if normalized is None:
+            normalized = unicodedata.normalize(self.normalization, name)
+            self._normalized[name] = normalized
+        
+        return normalized
+    
+    # Check for a match -----------------------------------------------------------------------------------------------------------
+    def matches(self, name: str) -> bool:
+        """
+        Check if the name contains the search term.
+
+        Args:
+            name (str): The (normalized) name to check.
+
+        Returns:
+            `True` if the search term is found in the name.
+        """
+        
+        if self.pattern is None:
+            return self.findWhat in name
+        
+        return self.pattern.search(name) is not None
+    
+    # Perform replacement ---------------------------------------------------------------------------------------------------------
+    def replace(self, name: str, replaceWith: str) -> str:
+        """
+        Replace all occurrences of the search term in the name.
+
+        Args:
+            name (str): The (normalized) name to perform replacement on.
+            replaceWith (str): The replacement text, with backreferences in regex mode.
+
+        Returns:
+            The name after replacement.
+        """
+        
+        if self.pattern is None:
+            return name.replace(self.findWhat, replaceWith)
+        
+        if self.isRegex:
+            return self.pattern.sub(replaceWith, name)
+        
+        # Plain text replacement shall not be interpreted for backreferences
+        return self.pattern.sub(lambda _: replaceWith, name)
@@ -0,0 +1,367 @@
+# T1nk-R's Unified Rename add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module is responsible for updating references to renamed items stored as names.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to get a single panel to batch rename collections and objects shown in Blender's Outliner
+# using text or regex-based search and replace.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to change the name of your Blender objects and collections matching the criteria you specify.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way.
+#   * You shall be able to simply undo consequences made by this add-on.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# *********************************************************************************************************************************
+
+from __future__ import annotations
+import re
+import bpy
+
+from . import renameMap
+
+# A reference by name #############################################################################################################
+class NameReference:
+    """
+    A string that may refer to objects or collections by name: a driver expression, the data path of a driver 
+    variable, or a custom property.
+    """
+    
+    __slots__ = ("owner", "kind", "container", "key")
+    
+    # Properties ==================================================================================================================
+    
+    kinds = {
+        'EXPRESSION': "driver expression",
+        'DATA_PATH': "driver variable path",
+        'PROPERTY': "custom property"
+    }
+    """
+    Kinds of references and their descriptions for reporting.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    
+    # Initialize object -----------------------------------------------------------------------------------------------------------
+    def __init__(self, owner, kind: str, container, key: str):
+        """
+        Make a reference.
+
+        Args:
+            owner (bpy.types.ID): The ID the string belongs to.
+            kind (str): Kind of the reference, a key of `kinds`.
+            container: The object holding the string, such as a driver, a driver target, an ID or a property group.
+            key (str): Name of the attribute (for drivers and targets) or key (for custom properties) of the string.
+        """
+        
+        self.owner = owner
+        self.kind = kind
+        self.container = container
+        self.key = key
+    
+    # Public functions ============================================================================================================
+    
+    # Get string ------------------------------------------------------------------------------------------------------------------
+    @property
+    def value(self) -> str:
+        if self.kind == 'PROPERTY':
+            return self.container[self.key]
+        return getattr(self.container, self.key)
+    
+    # Set string ------------------------------------------------------------------------------------------------------------------
+    @value.setter
+    def value(self, value: str):
+        if self.kind == 'PROPERTY':
+            self.container[self.key] = value
+        else:
+            setattr(self.container, self.key, value)
+    
+    # Describe for reporting ------------------------------------------------------------------------------------------------------
+    def __str__(self) -> str:
+        return f"{self.kinds[self.kind]} '{self.key}' of '{self.owner.name}'" if self.kind == 'PROPERTY' \
+            else f"{self.kinds[self.kind]} of '{self.owner.name}'"
+
+# Index of references by name #####################################################################################################
+class ReferenceIndex:
+    """
+    Index of strings in the file which may refer to objects or collections by name. The file is scanned once, and
+    each reference is indexed by the names it contains, so that references to renamed items can be found by lookup.
+    
+    Names are recognized as whole custom property values, and as quoted string literals in driver expressions and
+    data paths. Only literals used to look up objects or collections, that is, preceded by `objects[` or 
+    `collections[` as in `bpy.data.objects["Cube"]`, are rewritten. Other literals, such as in `pose.bones["Arm"]`, 
+    may be keys of anything else, so they are only reported. Custom properties are rewritten only for the keys 
+    specified, other custom properties having an old name as their value are reported separately.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    _idCollections = (
+        "actions", "armatures", "cameras", "collections", "curves", "grease_pencils", "images", "lattices", "lights",
+        "lightprobes", "materials", "meshes", "metaballs", "node_groups", "objects", "particles", "scenes", 
+        "shape_keys", "speakers", "textures", "volumes", "worlds"
+    )
+    """
+    Attributes of `bpy.data` listing IDs to scan. Attributes missing in the running Blender version are skipped.
+    """
+    
+    _literalPattern = re.compile(
+        r"""(?P<prefix>\b(?P<idType>objects|collections)\s*\[\s*)?(?P<quote>["'])(?P<name>(?:\\.|(?!(?P=quote))[^\\])*)(?P=quote)""")
+    """
+    Matches quoted string literals, and tells if they are used to look up objects or collections.
+    """
+    
+    _identifierPattern = re.compile(r"[^\W\d][\w.]*")
+    """
+    Matches unquoted identifiers, which may be names used in a way that cannot be fixed safely.
+    """
+    
+    _idTypes = {"objects": 'OBJECT', "collections": 'COLLECTION'}
+    """
+    Maps `bpy.data` collection names to ID types as used in rename maps.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    
+    # Initialize object -----------------------------------------------------------------------------------------------------------
+    def __init__(self, propertyKeys=()):
+        """
+        Scan the file and build the index.
+
+        Args:
+            propertyKeys: Keys of custom properties which hold names of objects or collections, and shall be fixed.
+        """
+        
+        self.propertyKeys = set(propertyKeys)
+        """
+        Keys of custom properties which hold names of objects or collections, and shall be fixed.
+        """
+        
+        self.references: dict[str, list[NameReference]] = {}
+        """
+        References by the names (string literals or whole property values) they contain.
+        """
+        
+        self.identifiers: dict[str, list[NameReference]] = {}
+        """
+        Driver expressions by the unquoted identifiers they contain.
+        """
+        
+        for attribute in self._idCollections:
+            for owner in getattr(bpy.data, attribute, []):
+                self._scanId(owner, owner)
+                
+                # Node trees of materials, worlds and scenes are embedded and not listed in `bpy.data`
+                nodeTree = getattr(owner, "node_tree", None)
+                if nodeTree is not None:
+                    self._scanId(owner, nodeTree)
+    
+    # Public functions ============================================================================================================
+    
+    # Fix references --------------------------------------------------------------------------------------------------------------
+    def fix(self, renames: renameMap.RenameMap, isTestOnly: bool = False) -> tuple[int, list[str], list[str]]:
+        """
+        Rewrite references to renamed items in a single sweep.
+
+        Args:
+            renames (renameMap.RenameMap): The renames performed.
+            isTestOnly (bool): `True` to only list the fixes without actually changing anything.
+
+        Returns:
+            A tuple of the number of references fixed (or in test mode, to fix), the list of problems found that 
+            could not be fixed, and the list of custom properties not among `propertyKeys` with an old name as value.
+        """
+        
+        # Old names mapped to new names by type. Linked items are not referred to by their plain names, so skip them.
+        newNames: dict[str, dict[str, str]] = {}
+        for e in renames:
+            if len(e.library) == 0:
+                newNames.setdefault(e.oldName, {})[e.idType] = e.newName
+        
+        # Collect affected references, each only once even if it contains several names
+        affected: dict[int, NameReference] = {}
+        for oldName in newNames:
+            for reference in self.references.get(oldName, []):
+                affected.setdefault(id(reference), reference)
+        
+        problems = []
+        unconfirmed = []
+        fixed = 0
+        
+        for reference in affected.values():
+            if reference.kind == 'PROPERTY' and reference.key not in self.propertyKeys:
+                # The value may just happen to be equal to an old name
+                unconfirmed.append(f"{reference} is '{reference.value}', the old name of a renamed item")
+                continue
+            
+            if reference.owner.library is not None:
+                problems.append(f"{reference} cannot be changed as it's linked from a library")
+                continue
+            
+            value = reference.value
+            
+            if reference.kind == 'PROPERTY':
+                newValue = self._newName(newNames[value], None, reference, value, problems)
+            else:
+                newValue = self._literalPattern.sub(
+                    lambda m: self._rewriteLiteral(m, newNames, reference, problems), value)
+            
+            if newValue is None or newValue == value:
+                continue
+            
+            print(f"* {reference}: '{value}' --> '{newValue}'")
+            
+            if not isTestOnly:
+                reference.value = newValue
+            
+            fixed = fixed + 1
+        
+        # Report old names used unquoted in expressions, those cannot be fixed without understanding the expression
+        for oldName in newNames:
+            for reference in self.identifiers.get(oldName, []):
+                problems.append(f"{reference} may refer to '{oldName}' without quotes, please check it manually")
+        
+        return fixed, problems, unconfirmed
+    
+    # Private functions ===========================================================================================================
+    
+    # Scan an ID ------------------------------------------------------------------------------------------------------------------
+    def _scanId(self, owner, item):
+        """
+        Index driver expressions, driver variable paths and custom properties of an ID.
+
+        Args:
+            owner (bpy.types.ID): The ID to report as the owner of references.
+            item (bpy.types.ID): The ID to scan, the owner itself or an ID embedded in it.
+        """
+        
+        animationData = getattr(item, "animation_data", None)
+        if animationData is not None:
+            for fcurve in animationData.drivers:
+                driver = fcurve.driver
+                reference = NameReference(owner, 'EXPRESSION', driver, "expression")
+                self._addLiterals(reference, driver.expression)
+                
+                # Look up identifiers with quoted literals removed, so that those are not reported as unquoted
+                for identifier in set(self._identifierPattern.findall(self._literalPattern.sub("", driver.expression))):
+                    self.identifiers.setdefault(identifier, []).append(reference)
+                
+                for variable in driver.variables:
+                    for target in variable.targets:
+                        if target.data_path:
+                            self._addLiterals(NameReference(owner, 'DATA_PATH', target, "data_path"), target.data_path)
+        
+        self._scanProperties(owner, item)
+    
+    # Scan custom properties ------------------------------------------------------------------------------------------------------
+    def _scanProperties(self, owner, container):
+        """
+        Index string custom properties, including those in nested property groups.
+
+        Args:
+            owner (bpy.types.ID): The ID the properties belong to.
+            container: The ID or property group holding the properties.
+        """
+        
+        for key in container.keys():
+            # Skip UI data of properties stored by Blender versions before 3.0
+            if key == "_RNA_UI":
+                continue
+            
+            value = container[key]
+            
+            if isinstance(value, str):
+                self.references.setdefault(value, []).append(NameReference(owner, 'PROPERTY', container, key))
+            elif hasattr(value, "keys"):
+                self._scanProperties(owner, value)
+    
+    # Index string literals -------------------------------------------------------------------------------------------------------
+    def _addLiterals(self, reference: NameReference, text: str):
+        """
+        Index the reference by each string literal it contains.
+        """
+        
+        for name in set(m.group("name") for m in self._literalPattern.finditer(text)):
+            self.references.setdefault(name, []).append(reference)
+    
+    # Rewrite a string literal ----------------------------------------------------------------------------------------------------
+    def _rewriteLiteral(self, match: re.Match, newNames: dict, reference: NameReference, problems: list) -> str:
+        """
+        Get the replacement of a string literal matched in an expression or a data path.
+        """
+        
+        name = match.group("name")
+        
+        if name not in newNames:
+            return match.group(0)
+        
+        idType = self._idTypes.get(match.group("idType"))
+        
+        # Literals not used to look up objects or collections may be keys of bones, modifiers, properties and so on
+        if idType is None:
+            problems.append(f"{reference} contains '{name}', which may refer to a renamed item, please check it manually")
+            return match.group(0)
+        
+        newName = self._newName(newNames[name], idType, reference, name, problems)
+        
+        if newName is None:
+            return match.group(0)
+        
+        quote = match.group("quote")
+        newName = newName.replace("\\", "\\\\").replace(quote, "\\" + quote)
+        
+        return f"{match.group('prefix') or ''}{quote}{newName}{quote}"
+    
+    # Resolve new name ------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _newName(newNamesByType: dict, idType: str, reference: NameReference, oldName: str, problems: list) -> str:
+        """
+        Get the new name for an old name referred to, or `None` if it cannot be determined, in which case the problem
+        is recorded.
+        """
+        
+        if idType is not None:
+            # The reference tells the type, it's fine if the other type was renamed
+            return newNamesByType.get(idType)
+        
+        if len(set(newNamesByType.values())) == 1:
+            return next(iter(newNamesByType.values()))
+        
+        problems.append(f"{reference} refers to '{oldName}', which is ambiguous as both an object and a collection " + \
+            "were renamed from it")
+        
+        return None
@@ -0,0 +1,328 @@
+# T1nk-R's Unified Rename add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module is responsible for protecting Blender against regular expressions taking too long to evaluate.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to get a single panel to batch rename collections and objects shown in Blender's Outliner
+# using text or regex-based search and replace.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to change the name of your Blender objects and collections matching the criteria you specify.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way.
+#   * You shall be able to simply undo consequences made by this add-on.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# *********************************************************************************************************************************
+
+# Note that this module is also run as a standalone script to evaluate regular expressions in a separate process, so it
+# shall not import Blender modules or other modules of the add-on.
+
+from __future__ import annotations
+import json
+import queue
+import re
+import subprocess
+import sys
+import threading
+
+try:
+    import re._parser as _sreParser # Python 3.11 and newer
+except ImportError:
+    import sre_parse as _sreParser
+
+# Regex guard #####################################################################################################################
+class RegexGuard:
+    """
+    Vets regular expressions before they are used on names. Patterns are checked for nested unbounded quantifiers, 
+    such as `(a+)+`, which may lead to catastrophic backtracking. Then names are matched in a worker process with a time
+    limit for each name, so that if a pattern takes too long on a name, the worker can be abandoned and the name
+    reported instead of freezing Blender.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    _chunkSize = 1000
+    """
+    Number of names sent to the worker in one go.
+    """
+    
+    _startupTimeLimit = 10.0
+    """
+    Time to wait for the worker to start (seconds).
+    """
+    
+    _repeatOps = ("MAX_REPEAT", "MIN_REPEAT")
+    """
+    Names of the opcodes of quantifiers that backtrack.
+    """
+    
+    _atomicOps = ("POSSESSIVE_REPEAT", "ATOMIC_GROUP")
+    """
+    Names of the opcodes of constructs that don't backtrack into their content.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    
+    # Initialize object -----------------------------------------------------------------------------------------------------------
+    def __init__(self, pattern: re.Pattern, timeLimit: float):
+        """
+        Make a guard for a pattern.
+
+        Args:
+            pattern (re.Pattern): The compiled pattern to vet.
+            timeLimit (float): The maximum time matching a name may take (seconds).
+        """
+        
+        self.pattern = pattern
+        """
+        The compiled pattern to vet.
+        """
+        
+        self.timeLimit = timeLimit
+        """
+        The maximum time matching a name may take (seconds).
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Check for nested quantifiers ------------------------------------------------------------------------------------------------
+    @classmethod
+    def hasNestedQuantifiers(cls, pattern: str) -> bool:
+        """
+        Check if the pattern contains an unbounded quantifier applied to something which also contains an unbounded 
+        quantifier, such as `(a+)+` or `(\\w*_?)*`. Possessive quantifiers and atomic groups are not considered, as 
+        they don't backtrack.
+
+        Args:
+            pattern (str): The regular expression to check.
+
+        Returns:
+            `True` if nested unbounded quantifiers are found.
+        """
+        
+        return cls._hasNestedQuantifiers(_sreParser.parse(pattern), False)
+    
+    # Match names in a worker -----------------------------------------------------------------------------------------------------
+    def matchingNames(self, names) -> set[str]:
+        """
+        Match the names in a worker process, abandoning the worker if matching a name takes longer than the time limit.
+
+        Args:
+            names: Iterable of the names to match.
+
+        Returns:
+            The set of names matching the pattern, or `None` if the worker process could not be started.
+
+        Raises:
+            Exception: If matching a name takes longer than the time limit, telling the name.
+        """
+        
+        try:
+            worker = subprocess.Popen(
+                [sys.executable, "-I", "-u", __file__], 
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, 
+                encoding="utf-8", errors="surrogatepass")
+        except Exception as ex:
+            print(f"Cannot start worker to evaluate the regular expression: {ex}")
+            return None
+        
+        # Read and write in threads so that the worker can be abandoned even while it has our pipes filled
+        results = queue.Queue()
+        requests = queue.Queue()
+        threading.Thread(target=self._readLines, args=(worker.stdout, results), daemon=True).start()
+        threading.Thread(target=self._writeLines, args=(worker.stdin, requests), daemon=True).start()
+        
+        try:
+            requests.put(json.dumps({"pattern": self.pattern.pattern, "flags": self.pattern.flags}) + "\n")
+            
+            if self._nextResult(results, self._startupTimeLimit) != "ready":
+                print("Cannot start worker to evaluate the regular expression")
+                return None
+            
+            matching = set()
+            chunk = []
+            
+            for name in names:
+                chunk.append(name)
+                
+                if len(chunk) == self._chunkSize:
+                    self._matchChunk(chunk, requests, results, matching)
+                    chunk = []
+            
+            self._matchChunk(chunk, requests, results, matching)
+            
+            return matching
+        
+        finally:
+            requests.put(None)
+            worker.kill()
+            worker.wait()
+    
+    # Private functions ===========================================================================================================
+    
+    # Look for nested quantifiers -------------------------------------------------------------------------------------------------
+    @classmethod
+    def _hasNestedQuantifiers(cls, subpattern, isInRepeat: bool) -> bool:
+        """
+        Recursively check parsed nodes for nested unbounded quantifiers.
+
+        Args:
+            subpattern: Parsed nodes as (opcode, argument) pairs.
+            isInRepeat (bool): `True` if the nodes are within an unbounded quantifier which backtracks.
+        """
+        
+        for op, av in subpattern:
+            opName = getattr(op, "name", str(op))
+            
+            if opName in cls._repeatOps:
+                isUnbounded = av[1] == _sreParser.MAXREPEAT
+                if isUnbounded and isInRepeat:
+                    return True
+                if cls._hasNestedQuantifiers(av[2], isInRepeat or isUnbounded):
+                    return True
+            elif opName in cls._atomicOps:
+                # Content is checked on its own, as no backtracking happens into it from outside
+                if cls._hasNestedQuantifiers(av[2] if opName == "POSSESSIVE_REPEAT" else av, False):
+                    return True
+            else:
+                for child in cls._children(opName, av):
+                    if cls._hasNestedQuantifiers(child, isInRepeat):
+                        return True
+        
+        return False
+    
+    # Get nested nodes ------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _children(opName: str, av) -> list:
+        """
+        Get the parsed subpatterns nested in a node other than a quantifier.
+        """
+        
+        if opName == "SUBPATTERN":
+            return [av[-1]]
+        if opName == "BRANCH":
+            return av[1]
+        if opName in ("ASSERT", "ASSERT_NOT"):
+            return [av[1]]
+        if opName == "GROUPREF_EXISTS":
+            return [child for child in av[1:] if child is not None]
+        
+        return []
+    
+    # Match a chunk of names ------------------------------------------------------------------------------------------------------
+    def _matchChunk(self, chunk: list[str], requests: queue.Queue, results: queue.Queue, matching: set):
+        """
+        Send names to the worker and collect the ones matching.
+        """
+        
+        if len(chunk) == 0:
+            return
+        
+        requests.put("".join(json.dumps(name) + "\n" for name in chunk))
+        
+        for name in chunk:
+            result = self._nextResult(results, self.timeLimit)
+            
+            if result is None:
+                raise Exception(f"Matching the regular expression on '{name}' takes longer than {self.timeLimit:g} " + \
+                    "second(s). Simplify the expression, for example avoid nesting quantifiers like in (a+)+")
+            
+            if result == "1":
+                matching.add(name)
+    
+    # Wait for a result -----------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _nextResult(results: queue.Queue, timeLimit: float) -> str:
+        """
+        Get the next line written by the worker, or `None` if it's not written in time or the worker has quit.
+        """
+        
+        try:
+            return results.get(timeout=timeLimit)
+        except queue.Empty:
+            return None
+    
+    # Read results (runs in a thread) ---------------------------------------------------------------------------------------------
+    @staticmethod
+    def _readLines(stream, results: queue.Queue):
+        try:
+            for line in stream:
+                results.put(line.rstrip("\n"))
+        except Exception:
+            # The worker has been killed
+            pass
+    
+    # Write requests (runs in a thread) -------------------------------------------------------------------------------------------
+    @staticmethod
+    def _writeLines(stream, requests: queue.Queue):
+        try:
+            while True:
+                text = requests.get()
+                if text is None:
+                    break
+                stream.write(text)
+                stream.flush()
+        except Exception:
+            # The worker has been killed
+            pass
+
+# Worker ##########################################################################################################################
+def _serve():
+    """
+    Evaluate the regular expression received in the first line of the standard input on the names received in the
+    following lines, one name per line as JSON strings. For each name, write 1 if it matches and 0 if not.
+    """
+    
+    request = json.loads(sys.stdin.readline())
+    pattern = re.compile(request["pattern"], request["flags"])
+    
+    sys.stdout.write("ready\n")
+    sys.stdout.flush()
+    
+    for line in sys.stdin:
+        name = json.loads(line)
+        
+        # Iterate over all matches, to perform all the matching work a substitution would do
+        isMatching = False
+        for _ in pattern.finditer(name):
+            isMatching = True
+        
+        sys.stdout.write("1\n" if isMatching else "0\n")
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    _serve()
@@ -0,0 +1,185 @@
+# T1nk-R's Unified Rename add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module is responsible for deciding when to check for updates, getting release information and comparing versions.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to get a single panel to batch rename collections and objects shown in Blender's Outliner
+# using text or regex-based search and replace.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to change the name of your Blender objects and collections matching the criteria you specify.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way.
+#   * You shall be able to simply undo consequences made by this add-on.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# *********************************************************************************************************************************
+
+# Note that this module shall not import Blender modules or other modules of the add-on, so that it can be used and
+# tested outside Blender, for example against a local stub server.
+
+import re
+from datetime import datetime, timedelta
+import requests
+
+# Properties ======================================================================================================================
+
+timestampFormat = '%Y-%m-%d %H:%M:%S'
+"""
+Format of timestamps stored in the update information.
+"""
+
+retryDelay = timedelta(minutes=30)
+"""
+Time to wait before retrying after the first failed check. The delay is doubled after each further failure, until it
+reaches the regular check frequency.
+"""
+
+# Public functions ================================================================================================================
+
+# Format a timestamp --------------------------------------------------------------------------------------------------------------
+def formatTimestamp(timestamp: datetime) -> str:
+    """
+    Format a timestamp to store in the update information.
+    """
+    
+    return datetime.strftime(timestamp, timestampFormat)
+
+# Parse a stored timestamp --------------------------------------------------------------------------------------------------------
+def parseTimestamp(timestamp: str) -> datetime:
+    """
+    Parse a timestamp stored in the update information.
+
+    Returns:
+        The date and time, or `None` if the timestamp is empty or invalid.
+    """
+    
+    try:
+        return datetime.strptime(timestamp, timestampFormat)
+    except ValueError:
+        return None
+
+# Tell if a check is due ----------------------------------------------------------------------------------------------------------
+def isCheckDue(updateInfo, now: datetime) -> bool:
+    """
+    Tell if a check for updates shall be performed, that is, if the cached information is older than 
+    `checkFrequencyDays`, and if the last check failed, enough time has passed since then. The time to wait after a 
+    failure starts from `retryDelay` and is doubled after each further failure.
+
+    Args:
+        updateInfo: The cached update information, such as a `T1nkerUnifiedRenameUpdateInfo`. Any object with 
+            `checkFrequencyDays`, `lastCheckedTimestamp`, `lastFailedTimestamp` and `failureCount` attributes will do.
+        now (datetime): The current date and time.
+
+    Returns:
+        `True` if a check is due.
+    """
+    
+    checkFrequency = timedelta(days=updateInfo.checkFrequencyDays)
+    
+    lastChecked = parseTimestamp(updateInfo.lastCheckedTimestamp)
+    if lastChecked is not None and now - lastChecked < checkFrequency:
+        # Do not flood the repo API, use cached info
+        return False
+    
+    lastFailed = parseTimestamp(updateInfo.lastFailedTimestamp)
+    if lastFailed is not None and updateInfo.failureCount > 0:
+        backoff = min(retryDelay * (2 ** min(updateInfo.failureCount - 1, 16)), checkFrequency)
+        if now - lastFailed < backoff:
+            return False
+    
+    return True
+
+# Get latest release information --------------------------------------------------------------------------------------------------
+def fetchLatestRelease(url: str, etag: str = "", lastModified: str = "", timeout: float = 5, auth: tuple = None) -> tuple:
+    """
+    Get information about the latest release, unless it has not changed since it was last got.
+
+    Args:
+        url (str): The API URL of the latest release.
+        etag (str): The `ETag` header of the last successful response, if any.
+        lastModified (str): The `Last-Modified` header of the last successful response, if any.
+        timeout (float): Time to wait for the server (seconds).
+        auth (tuple): User name and token to authenticate with, if any.
+
+    Returns:
+        A tuple of the release information parsed from the response (`None` if it has not changed), and the `ETag`
+        and `Last-Modified` headers to store for the next check.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails or the server responds with an error.
+    """
+    
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if lastModified:
+        headers["If-Modified-Since"] = lastModified
+    
+    response = requests.get(url, timeout=timeout, auth=auth, headers=headers)
+    
+    if response.status_code == 304: # Not modified
+        return None, etag, lastModified
+    
+    response.raise_for_status()
+    
+    return response.json(), response.headers.get("ETag", ""), response.headers.get("Last-Modified", "")
+
+# Compare versions ----------------------------------------------------------------------------------------------------------------
+def isNewerVersion(latestVersion: str, installedVersion: tuple) -> bool:
+    """
+    Tell if the latest release is newer than the installed version.
+
+    Args:
+        latestVersion (str): The release tag of the latest version, such as `v1.2.3` or `v1.2.3-alpha`.
+        installedVersion (tuple): The installed version as in `bl_info`, such as `(1, 2, 3)`.
+
+    Returns:
+        `True` if the latest release is newer.
+
+    Raises:
+        Exception: If the release tag is not a version number.
+    """
+    
+    # Trim leading v and eventual trailing qualifiers such as -alpha
+    match = re.match(r"[v]((\d+\.)*(\d+)).*", latestVersion)
+    if match is None:
+        raise Exception(f"Cannot parse version '{latestVersion}'")
+    
+    # Parse into a list
+    latestVersionTags = [int(t) for t in match[1].split(".")]
+    
+    return tuple(latestVersionTags) > tuple(installedVersion)
@@ -49,15 +49,37 @@
 # *********************************************************************************************************************************
 
 from datetime import datetime
+from itertools import chain
+import tracemalloc
 import bpy
-import re
-from bpy.props import StringProperty, BoolProperty, EnumProperty, PointerProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty, PointerProperty, IntProperty, FloatProperty
 from bpy.types import Operator, AddonPreferences, PropertyGroup
 
 from . import updateChecker
+from . import templates
+from . import matching
+from . import renameMap
+from . import references
+from . import regexGuard
+from . import hooks
+from . import conflicts
 
 # Addon settings for add-on preferences ###########################################################################################
 class T1nkerUnifiedRenameAddonSettings(PropertyGroup):
+    mode: EnumProperty(
+        name="Mode",
+        description="How to determine new names",
+        items=[
+            ('FIND_REPLACE', "Find and replace", "Find and replace text in the names of selected items"),
+            ('APPLY_MAP', "Apply rename map", "Rename items of this file as listed in a rename map saved earlier")
+        ],
+        default='FIND_REPLACE'
+    )
+    """
+    Tells whether to find and replace text in the names of selected items (`FIND_REPLACE`) or to rename all items of 
+    the file as listed in the rename map file specified in `mapFilePath` (`APPLY_MAP`).
+    """
+
     isRegex: BoolProperty(
         name="Use regex", 
         description="Click if you want to use regular expressions",
@@ -83,6 +105,71 @@ class T1nkerUnifiedRenameAddonSettings(PropertyGroup):
     Replacement text or expression.
     """
 
+    regexTimeLimit: FloatProperty(
+        name="Time limit per name (s)", 
+        description="Maximum time matching the regular expression on a name may take. Names are matched in a separate process which is abandoned if this is exceeded. Set to 0 to match in Blender without a time limit, in which case expressions with nested quantifiers like (a+)+ are refused",
+        default=1.0,
+        min=0.0
+    )
+    """
+    Maximum time (seconds) matching the regular expression on a single name may take before the operation is cancelled.
+    If 0, names are matched in Blender's process, and patterns with nested quantifiers are refused as they could freeze it.
+    """
+
+    ignoreCase: BoolProperty(
+        name="Ignore case", 
+        description="Match regardless of letter case",
+        default=False
+    )
+    """
+    If checked (`True`), the search term matches names regardless of letter case, both in plain text and regex mode.
+    """
+
+    wholeWord: BoolProperty(
+        name="Whole words only", 
+        description="Match only whole words, that is, text delimited by the start or end of the name, or by characters other than letters and digits (such as _, . or -)",
+        default=False
+    )
+    """
+    If checked (`True`), the search term only matches if it's not directly preceded or followed by a letter or a digit.
+    Underscores, dots, dashes and spaces count as delimiters.
+    """
+
+    normalization: EnumProperty(
+        name="Unicode normalization",
+        description="Normalize names and the search term before matching, so that visually identical names match",
+        items=[
+            ('NONE', "None", "Match names as they are"),
+            ('NFC', "NFC", "Canonical composition, for example to match accented letters typed in different ways"),
+            ('NFKC', "NFKC", "Compatibility composition, also matching full-width letters, ligatures and the like")
+        ],
+        default='NONE'
+    )
+    """
+    Unicode normalization form to apply to names and the search term before matching. Renamed items get the normalized
+    form of their name.
+    """
+
+    useTemplate: BoolProperty(
+        name="Use tokens", 
+        description="Expand tokens such as {collection}, {parent}, {type}, {data}, {scene}, {name} and {index:03} in the replacement",
+        default=False
+    )
+    """
+    If checked (`True`), tokens in braces in `Replace with` are replaced by values specific to each renamed item. See
+    `templates.ReplacementTemplate` for the list of tokens.
+    """
+
+    startIndex: IntProperty(
+        name="Start index", 
+        description="The first value of the {index} token",
+        default=1,
+        min=0
+    )
+    """
+    The value of the `{index}` token for the first affected item, incremented for each subsequent one.
+    """
+
     includeObjects: BoolProperty(
         name="Include objects", 
         description="Perform replacement on objects",
@@ -101,6 +188,81 @@ class T1nkerUnifiedRenameAddonSettings(PropertyGroup):
     Tells if scope shall be extended to collections. If checked (`True`), collections will be renamed if they are included in the scope.
     """
 
+    includeChildren: BoolProperty(
+        name="Include children recursively", 
+        description="Extend the scope to all collections and objects within selected collections, at any depth",
+        default=False
+    )
+    """
+    If checked (`True`), child collections and objects of selected collections are also in scope, at any depth. Items
+    linked to several collections are renamed only once.
+    """
+
+    fixReferences: BoolProperty(
+        name="Fix references", 
+        description="Update driver expressions, driver variable paths and custom properties referring to renamed items by name",
+        default=False
+    )
+    """
+    If checked (`True`), strings referring to renamed items by name are updated after renaming. See 
+    `references.ReferenceIndex` for what is recognized as a reference. References that cannot be fixed are reported.
+    """
+
+    referenceProperties: StringProperty(
+        name="Custom properties to fix", 
+        description="Comma-separated keys of custom properties holding names of objects or collections, to update when fixing references. Other custom properties with an old name as value are only reported",
+        default=""
+    )
+    """
+    Comma-separated keys of custom properties which hold names of objects or collections, and shall be updated when 
+    fixing references. String custom properties with other keys are not changed, but reported if their value is the 
+    old name of a renamed item.
+    """
+
+    exportMap: BoolProperty(
+        name="Export rename map", 
+        description="Save the list of renames to the rename map file, so that you can apply the same renames to other files",
+        default=False
+    )
+    """
+    If checked (`True`), the renames performed (or in test mode, planned) are saved to the file specified in `mapFilePath`.
+    """
+
+    mapFilePath: StringProperty(
+        name="Rename map file", 
+        description="File to save renames to or load them from. Use a .csv extension for CSV, anything else for JSON",
+        subtype='FILE_PATH'
+    )
+    """
+    Path of the rename map file to export to or to apply. The format is CSV if the extension is `.csv`, JSON otherwise.
+    """
+
+    conflictPolicy: EnumProperty(
+        name="On name conflict",
+        description="What to do if an item would get a name already used by another item of the same type",
+        items=[
+            ('AUTO_SUFFIX', "Add suffix", "Add a numeric suffix such as .001 to make the name unique, like Blender would"),
+            ('SKIP', "Skip", "Leave items with conflicting new names unchanged"),
+            ('ABORT', "Abort", "Don't rename anything if there's any conflict")
+        ],
+        default='AUTO_SUFFIX'
+    )
+    """
+    What to do if an item would get a name already used by another item of the same type, either because several
+    items would be renamed to the same name, or because an item not renamed already has it. Conflicts are detected and 
+    reported before anything is renamed.
+    """
+
+    reportMemory: BoolProperty(
+        name="Report peak memory", 
+        description="Measure and report the peak Python memory used by the operation. Makes the operation somewhat slower",
+        default=False
+    )
+    """
+    If checked (`True`), Python memory allocations are traced during the operation and the peak is reported in the 
+    System Console, so that you can check memory use on large files.
+    """
+
     isTestOnly: BoolProperty(
         name="Just a test", 
         description="Just list replacements, but don't actually change anything",
@@ -148,8 +310,18 @@ class T1nkerUnifiedRenameAddonPreferences(AddonPreferences):
         
         layout.label(text="Default settings")                
         layout.prop(self.settings, "isRegex")        
+        layout.prop(self.settings, "ignoreCase")
+        layout.prop(self.settings, "wholeWord")
+        layout.prop(self.settings, "normalization")
+        layout.prop(self.settings, "useTemplate")
         layout.prop(self.settings, "includeObjects")        
         layout.prop(self.settings, "includeCollections")    
+        layout.prop(self.settings, "includeChildren")
+        layout.prop(self.settings, "fixReferences")
+        layout.prop(self.settings, "referenceProperties")
+        layout.prop(self.settings, "conflictPolicy")
+        
+        layout.prop(self.updateInfo, "offlineMode")
         
         # Update available button
         #
@@ -202,6 +374,33 @@ class T1NKER_OT_UnifiedRename(Operator):
         """
         Copy of the operator settings specific to the Blender file (scene)
         """
+        
+        self._matcher: matching.NameMatcher = None
+        """
+        The compiled search term for the current run.
+        """
+        
+        self._matchingNames: set = None
+        """
+        Names found matching the regular expression when vetting it for the current run, or `None` if names are matched 
+        as they are processed.
+        """
+        
+        self._collectionTree: list = None
+        """
+        Selected collections and all collections within them for the current run, each listed once, or `None` if not yet
+        determined.
+        """
+        
+        self._template: templates.ReplacementTemplate = None
+        """
+        The parsed replacement template for the current run, or `None` if tokens are not used.
+        """
+        
+        self._renameMap: renameMap.RenameMap = None
+        """
+        The renames performed (or in test mode, planned) in the current run.
+        """
     
     # Public functions ============================================================================================================
     
@@ -215,14 +414,35 @@ class T1NKER_OT_UnifiedRename(Operator):
                 
         layout = self.layout        
         
+        box = layout.box()
+        box.row().prop(self.settings, "mode", expand=True)
+        
+        if self.settings.mode == 'APPLY_MAP':
+            box.row().prop(self.settings, "mapFilePath")
+        
         box = layout.box()        
         box.row().label(text="What and how to find and replace")        
         innerBox = box.box()
+        innerBox.enabled = self.settings.mode == 'FIND_REPLACE'
+        
+        row = innerBox.row()
+        row.prop(self.settings, "isRegex")
+        if self.settings.isRegex:
+            row.prop(self.settings, "regexTimeLimit")
+        
+        row = innerBox.row()
+        row.prop(self.settings, "ignoreCase")
+        row.prop(self.settings, "wholeWord")
+        innerBox.row().prop(self.settings, "normalization")
         
-        innerBox.row().prop(self.settings, "isRegex")
         innerBox.row().prop(self.settings, "findWhat")
         innerBox.row().prop(self.settings, "replaceWith")
         
+        row = innerBox.row()
+        row.prop(self.settings, "useTemplate")
+        if self.settings.useTemplate:
+            row.prop(self.settings, "startIndex")
+        
         box = layout.box()
         box.row().label(text="Specify scope")        
         innerBox = box.box()
@@ -235,10 +455,24 @@ class T1NKER_OT_UnifiedRename(Operator):
         row.label(text="", icon="OUTLINER_COLLECTION")
         row.prop(self.settings, "includeCollections")
         
+        row = innerBox.row()
+        row.label(text="", icon="OUTLINER")
+        row.prop(self.settings, "includeChildren")
+        
         box = layout.box()
         box.row().label(text="Operation mode")        
         innerBox = box.box()        
         innerBox.row().prop(self.settings, "isTestOnly")  
+        innerBox.row().prop(self.settings, "conflictPolicy")
+        innerBox.row().prop(self.settings, "fixReferences")
+        if self.settings.fixReferences:
+            innerBox.row().prop(self.settings, "referenceProperties")
+        innerBox.row().prop(self.settings, "reportMemory")
+        
+        if self.settings.mode == 'FIND_REPLACE':
+            innerBox.row().prop(self.settings, "exportMap")
+            if self.settings.exportMap:
+                innerBox.row().prop(self.settings, "mapFilePath")
         
         # Update available button
         #
@@ -314,8 +548,12 @@ class T1NKER_OT_UnifiedRename(Operator):
         operationStarted = f"{datetime.strftime(datetime.now(), '%Y-%m-%d %H:%M:%S')}"
         
         status = None
-        collectionsRenamed = 0
-        objectsRenamed = 0
+        self._renameMap = None
+        
+        # Trace memory only if not already traced by someone else, whose measurements shall not be messed up
+        isTracingMemory = self.settings.reportMemory and not tracemalloc.is_tracing()
+        if isTracingMemory:
+            tracemalloc.start()
         
         try:
             print("")
@@ -331,34 +569,43 @@ class T1NKER_OT_UnifiedRename(Operator):
                 print(f"Operating in production mode, names of matching elements will actually be changed")
             print("")
             
-            # Check if the find what expression is empty and terminate gracefully if it is
-            if len(self.settings.findWhat) == 0:
-                raise Exception("No search term is specified, there's nothing to do")
-            
             # Check and terminate gracefully if scope is empty
             if not self.settings.includeObjects and not self.settings.includeCollections:
                 raise Exception("Empty scope specified. Include at least objects or collections.")
                 return {'CANCELLED'}
             
-            # Collect selected collections and objects
-            collections = [i for i in bpy.context.selected_ids if isinstance(i, bpy.types.Collection)]
-            objects = [i for i in bpy.context.selected_ids if isinstance(i, bpy.types.Object)]
+            # Check export settings before renaming anything, as failing afterwards would not let undo the renames
+            if self.settings.mode == 'FIND_REPLACE' and self.settings.exportMap and len(self.settings.mapFilePath) == 0:
+                raise Exception("No rename map file is specified to export renames to")
             
-            # Rename collections if requested
-            if self.settings.includeCollections:
-                for collectionElement in collections:
-                    collection: bpy.types.Collection = collectionElement
-                    renamed = self._performFindAndReplace(collection)
-                    if renamed:
-                        collectionsRenamed = collectionsRenamed + 1
-
-            # Rename objects if requested
-            if self.settings.includeObjects:
-                for objectElement in objects:
-                    object: bpy.types.Object = objectElement
-                    renamed = self._performFindAndReplace(object)   
-                    if renamed:
-                        objectsRenamed = objectsRenamed + 1
+            if self.settings.mode == 'APPLY_MAP':
+                plan = self._renameMapPlan()
+            else:
+                plan = self._findAndReplacePlan()
+            
+            # Check the complete plan for name conflicts before renaming anything. The plan holds only items to rename.
+            resolver = conflicts.ConflictResolver(self.settings.conflictPolicy)
+            try:
+                plan = resolver.resolve(list(plan))
+            finally:
+                self._reportConflicts(resolver.conflicts)
+            
+            self._renameMap = renameMap.RenameMap()
+            
+            if self.settings.isTestOnly:
+                for item, newName in plan:
+                    self._listRename(item, newName)
+            else:
+                # Rename in an order in which no item takes a name still held by another one
+                resolver.rename(plan, self._renameMap.add)
+            
+            # Update strings referring to renamed items by name
+            if self.settings.fixReferences and len(self._renameMap) > 0:
+                self._fixReferences()
+            
+            # Save renames for applying them to other files
+            if self.settings.mode == 'FIND_REPLACE' and self.settings.exportMap:
+                self._exportRenameMap()
             
             status = {'FINISHED'}
         
@@ -370,12 +617,24 @@ class T1NKER_OT_UnifiedRename(Operator):
         finally: # Print some summary
             # Leave here instead of moving toward the end of the try block as some things might have been changed
             # even if an error occurred afterwards            
+            objectsRenamed = self._renameMap.countOf('OBJECT') if self._renameMap is not None else 0
+            collectionsRenamed = self._renameMap.countOf('COLLECTION') if self._renameMap is not None else 0
+            
             summary = \
                 f"Renamed {objectsRenamed if objectsRenamed > 0 else 'no'} object(s) " + \
                 f"and {collectionsRenamed if collectionsRenamed > 0 else 'no'} collections"
                             
             self.report({'INFO'}, summary)
             
+            # Let handlers know what has been renamed, even if the operation was cancelled halfway
+            if self._renameMap is not None and len(self._renameMap) > 0:
+                hooks.notifyPostRename(self._makeEvent(self._renameMap, operationStarted, isComplete=status == {'FINISHED'}))
+            
+            if isTracingMemory:
+                _, peakMemory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                summary = summary + f". Peak Python memory used: {peakMemory / 1048576:.1f} MiB"
+            
             print("")
             print(f"-" * 80)
             print(summary)    
@@ -411,48 +670,305 @@ class T1NKER_OT_UnifiedRename(Operator):
         # No Outliner area open
         return None
 
-    # Perform the operation -------------------------------------------------------------------------------------------------------
-    def _performFindAndReplace(self, item):
+    # Find and replace in selected items ------------------------------------------------------------------------------------------
+    def _findAndReplacePlan(self):
+        """
+        Prepare find and replace on selected collections and objects as specified in the settings.
+
+        Returns:
+            A generator of the items to rename and their new names as tuples.
+        """
+        
+        # Check if the find what expression is empty and terminate gracefully if it is
+        if len(self.settings.findWhat) == 0:
+            raise Exception("No search term is specified, there's nothing to do")
+        
+        # Compile the search term once per run
+        self._matcher = matching.NameMatcher(
+            self.settings.findWhat, 
+            isRegex=self.settings.isRegex, 
+            ignoreCase=self.settings.ignoreCase, 
+            wholeWord=self.settings.wholeWord, 
+            normalization=self.settings.normalization)
+        
+        self._collectionTree = None
+        
+        # Make sure the regular expression does not freeze Blender before changing anything
+        self._matchingNames = self._vetRegex() if self.settings.isRegex else None
+        
+        # Parse the replacement template once per run
+        self._template = None
+        if self.settings.useTemplate:
+            self._template = templates.ReplacementTemplate(
+                self.settings.replaceWith, isRegex=self.settings.isRegex, startIndex=self.settings.startIndex)
+        
+        # Stream items through matching, so that only items to rename are kept in memory
+        return self._plan(self._scope())
+    
+    # Vet the regular expression ---------------------------------------------------------------------------------------------------
+    def _vetRegex(self) -> set:
+        """
+        Check the regular expression for nested quantifiers, and match it on the names in scope in a worker process
+        with a time limit, if one is set.
+
+        Returns:
+            The set of (normalized) names in scope matching the expression, or `None` if names shall be matched in 
+            Blender's process as they are processed.
+
+        Raises:
+            Exception: If the expression is refused or takes too long to match a name.
+        """
+        
+        hasNestedQuantifiers = regexGuard.RegexGuard.hasNestedQuantifiers(self._matcher.pattern.pattern)
+        nestedQuantifiersError = "The regular expression contains nested quantifiers like in (a+)+, which may freeze " + \
+            "Blender. Simplify it or set a time limit."
+        
+        if self.settings.regexTimeLimit <= 0:
+            if hasNestedQuantifiers:
+                raise Exception(nestedQuantifiersError)
+            return None
+        
+        if hasNestedQuantifiers:
+            print("The regular expression contains nested quantifiers like in (a+)+, it will be stopped if it takes too long")
+            print("")
+        
+        guard = regexGuard.RegexGuard(self._matcher.pattern, self.settings.regexTimeLimit)
+        matchingNames = guard.matchingNames(self._matcher.normalize(item.name) for item in self._scope())
+        
+        if matchingNames is None and hasNestedQuantifiers:
+            # Could not start the worker, and we don't dare to run the expression in Blender
+            raise Exception(nestedQuantifiersError)
+        
+        return matchingNames
+    
+    # Get items in scope ----------------------------------------------------------------------------------------------------------
+    def _scope(self):
+        """
+        Get selected collections (first) and objects as specified by the scope settings.
+
+        Yields:
+            bpy.types.Collection or bpy.types.Object: The items in scope.
+        """
+        
+        selectedIds = bpy.context.selected_ids
+        
+        if not self.settings.includeChildren:
+            if self.settings.includeCollections:
+                yield from (i for i in selectedIds if isinstance(i, bpy.types.Collection))
+            
+            if self.settings.includeObjects:
+                yield from (i for i in selectedIds if isinstance(i, bpy.types.Object))
+            
+            return
+        
+        # Walk the collection tree only once per run, even if the scope is iterated several times
+        if self._collectionTree is None:
+            self._collectionTree = self._walkCollections(i for i in selectedIds if isinstance(i, bpy.types.Collection))
+        
+        if self.settings.includeCollections:
+            yield from self._collectionTree
+        
+        if self.settings.includeObjects:
+            # Objects may be selected and linked to several collections at once, but shall be renamed only once
+            seen = set()
+            
+            for item in chain(
+                    (i for i in selectedIds if isinstance(i, bpy.types.Object)), 
+                    (o for c in self._collectionTree for o in c.objects)):
+                if item not in seen:
+                    seen.add(item)
+                    yield item
+    
+    # Walk the collection tree ----------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _walkCollections(collections) -> list:
         """
-        Check if the object received is subject to renaming and perform rename if it is.
+        Get the collections and all collections within them at any depth. Collections linked to several parents 
+        (or selected along with a parent) are listed only once.
 
         Args:
-            object (bpy.types.Object or bpy.types.Collection): The object or collection to rename if matching conditions.
+            collections: Iterable of the collections to start from.
 
         Returns:
-            True if the item was renamed, false if not
+            The collections found, parents preceding their children.
         """
         
-        renamed = False
+        result = []
+        seen = set()
+        stack = list(reversed(list(collections)))
         
-        if self.settings.isRegex: # treat the find and replace pattern regular expressions
-            replacement = re.sub(string = item.name, pattern = self.settings.findWhat, repl = self.settings.replaceWith)
+        while len(stack) > 0:
+            collection = stack.pop()
             
-            if item.name == replacement:
-                if self.settings.isTestOnly:    
-                    print(f"* '{item.name}' is not affected")
-            else:
-                renamed = True
-                
-                if self.settings.isTestOnly:
-                    print(f"* '{item.name}' --> '{replacement}'")
+            if collection in seen:
+                continue
+            
+            seen.add(collection)
+            result.append(collection)
+            stack.extend(reversed(collection.children))
+        
+        return result
+    
+    # Plan renames ----------------------------------------------------------------------------------------------------------------
+    def _plan(self, items):
+        """
+        Determine the new names of items. Items not affected are not yielded (in test mode, they are listed in the
+        System Console).
 
-            if not self.settings.isTestOnly:
-                item.name = re.sub(string = item.name, pattern = self.settings.findWhat, repl = self.settings.replaceWith)                    
-                
-        else: # treat the find and replace pattern plain text
-            replacement = item.name.replace(self.settings.findWhat, self.settings.replaceWith)
+        Args:
+            items: Iterable of the objects and collections in scope.
+
+        Yields:
+            tuple: The item to rename and its new name.
+        """
+        
+        for item in items:
+            newName = self._newNameOf(item)
             
-            if item.name == replacement:
+            if newName is None:
                 if self.settings.isTestOnly:
                     print(f"* '{item.name}' is not affected")
-            else:
-                renamed = True
-                
-                if self.settings.isTestOnly:
-                    print(f"* '{item.name}' --> '{replacement}'")
-                    
-            if not self.settings.isTestOnly:
-                item.name = replacement
-                
-        return renamed
\ No newline at end of file
+                continue
+            
+            yield item, newName
+    
+    # Plan applying a rename map --------------------------------------------------------------------------------------------------
+    def _renameMapPlan(self) -> list:
+        """
+        Find collections and objects of the file to rename as listed in the rename map file specified in the settings.
+
+        Returns:
+            The list of items to rename and their new names as tuples.
+        """
+        
+        if len(self.settings.mapFilePath) == 0:
+            raise Exception("No rename map file is specified to apply")
+        
+        print(f"Applying rename map {bpy.path.abspath(self.settings.mapFilePath)}")
+        print("")
+        
+        return renameMap.RenameMap.load(self.settings.mapFilePath).plan(
+            includeObjects=self.settings.includeObjects, 
+            includeCollections=self.settings.includeCollections)
+    
+    # Export renames --------------------------------------------------------------------------------------------------------------
+    def _exportRenameMap(self):
+        """
+        Save the renames to the rename map file specified in the settings. Failing to save is reported, but does not
+        cancel the operation, as names have already been changed by then.
+        """
+        
+        try:
+            self._renameMap.save(self.settings.mapFilePath)
+            print("")
+            print(f"Rename map saved to {bpy.path.abspath(self.settings.mapFilePath)}")
+        except Exception as ex:
+            print(f"Cannot save rename map: {ex}")
+            self.report({'ERROR'}, f"Cannot save rename map: {ex}")
+    
+    # Report name conflicts --------------------------------------------------------------------------------------------------------
+    def _reportConflicts(self, conflictsFound: list):
+        """
+        List name conflicts in the System Console and warn about them.
+
+        Args:
+            conflictsFound (list[str]): Descriptions of the conflicts.
+        """
+        
+        if len(conflictsFound) == 0:
+            return
+        
+        print("Name conflicts found:")
+        for conflict in conflictsFound:
+            print(f"* {conflict}")
+        print("")
+        
+        if self.settings.conflictPolicy != 'ABORT':
+            self.report({'WARNING'}, f"{len(conflictsFound)} name conflict(s) found, see the System Console for details")
+    
+    # Make an event for handlers --------------------------------------------------------------------------------------------------
+    def _makeEvent(self, renames: renameMap.RenameMap, started: str, isComplete: bool = True) -> hooks.RenameEvent:
+        """
+        Make an event describing the operation for rename handlers.
+
+        Args:
+            renames (renameMap.RenameMap): The renames planned or performed.
+            started (str): Date and time when the operation started.
+            isComplete (bool): `False` if the operation was cancelled after renaming some items.
+
+        Returns:
+            The event.
+        """
+        
+        return hooks.RenameEvent(renames, self.settings.mode, self.settings.isTestOnly, started, isComplete=isComplete)
+    
+    # Fix references by name ------------------------------------------------------------------------------------------------------
+    def _fixReferences(self):
+        """
+        Update strings referring to renamed items by name, and report references which could not be fixed.
+        """
+        
+        print("")
+        print("Fixing references to renamed items")
+        print("")
+        
+        propertyKeys = [k.strip() for k in self.settings.referenceProperties.split(",") if len(k.strip()) > 0]
+        
+        fixed, problems, unconfirmed = references.ReferenceIndex(propertyKeys).fix(
+            self._renameMap, isTestOnly=self.settings.isTestOnly)
+        
+        print("")
+        print(f"{'Would fix' if self.settings.isTestOnly else 'Fixed'} {fixed if fixed > 0 else 'no'} reference(s)")
+        
+        if len(problems) > 0:
+            print("")
+            print("References that could not be fixed:")
+            for problem in problems:
+                print(f"* {problem}")
+            
+            self.report({'WARNING'}, f"{len(problems)} reference(s) could not be fixed, see the System Console for details")
+        
+        if len(unconfirmed) > 0:
+            print("")
+            print("Custom properties with old names as values, not changed as their keys are not listed to fix:")
+            for item in unconfirmed:
+                print(f"* {item}")
+    
+    # Determine new name ----------------------------------------------------------------------------------------------------------
+    def _newNameOf(self, item) -> str:
+        """
+        Check if the item is subject to renaming and determine its new name if it is.
+
+        Args:
+            item (bpy.types.Object or bpy.types.Collection): The object or collection to rename if matching conditions.
+
+        Returns:
+            The new name of the item, or `None` if the item is not affected.
+        """
+        
+        name = self._matcher.normalize(item.name)
+        
+        # Check for a match first so that the template (and its counter) is only evaluated for affected items
+        if self._matchingNames is not None:
+            if name not in self._matchingNames:
+                return None
+        elif not self._matcher.matches(name):
+            return None
+        
+        replaceWith = self._template.expand(item) if self._template is not None else self.settings.replaceWith
+        replacement = self._matcher.replace(name, replaceWith)
+        
+        return replacement if replacement != item.name else None
+    
+    # List a planned rename -------------------------------------------------------------------------------------------------------
+    def _listRename(self, item, newName: str):
+        """
+        List a rename in test mode and record it in `_renameMap`, without actually changing anything.
+
+        Args:
+            item (bpy.types.Object or bpy.types.Collection): The object or collection that would be renamed.
+            newName (str): The new name.
+        """
+        
+        print(f"* '{item.name}' --> '{newName}'")
+        self._renameMap.addEntry(*renameMap.RenameMap.keyOf(item), item.name, newName)
@@ -0,0 +1,403 @@
+# T1nk-R's Unified Rename add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module is responsible for recording, saving, loading and applying rename maps.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to get a single panel to batch rename collections and objects shown in Blender's Outliner
+# using text or regex-based search and replace.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to change the name of your Blender objects and collections matching the criteria you specify.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way.
+#   * You shall be able to simply undo consequences made by this add-on.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# *********************************************************************************************************************************
+
+from __future__ import annotations
+import csv
+import json
+import os
+import bpy
+
+# A single rename #################################################################################################################
+class RenameMapEntry:
+    """
+    A single rename: the type, library and old name identifying the ID, and its new name.
+    """
+    
+    __slots__ = ("idType", "library", "oldName", "newName")
+    
+    # Lifecycle management ========================================================================================================
+    
+    # Initialize object -----------------------------------------------------------------------------------------------------------
+    def __init__(self, idType: str, library: str, oldName: str, newName: str):
+        """
+        Make an entry.
+
+        Args:
+            idType (str): Type of the ID, `OBJECT` or `COLLECTION`.
+            library (str): Path of the library the ID is linked from, or an empty string for local IDs.
+            oldName (str): Name of the ID before renaming.
+            newName (str): Name of the ID after renaming.
+        """
+        
+        self.idType = idType
+        """
+        Type of the ID, `OBJECT` or `COLLECTION`.
+        """
+        
+        self.library = library
+        """
+        Path of the library the ID is linked from, or an empty string for local IDs.
+        """
+        
+        self.oldName = oldName
+        """
+        Name of the ID before renaming.
+        """
+        
+        self.newName = newName
+        """
+        Name of the ID after renaming.
+        """
+
+# Rename map ######################################################################################################################
+class RenameMap:
+    """
+    An ordered list of renames, which can be saved to and loaded from JSON or CSV files, and applied to the current file
+    by looking up each name in a dictionary.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    idTypes = {
+        bpy.types.Object: 'OBJECT',
+        bpy.types.Collection: 'COLLECTION'
+    }
+    """
+    Blender types supported and their type names in rename maps.
+    """
+    
+    _csvColumns = ["type", "library", "old", "new"]
+    """
+    Column headers of the CSV format, also used as keys in the JSON format.
+    """
+    
+    _formatVersion = 1
+    """
+    Version of the JSON format.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    
+    # Initialize object -----------------------------------------------------------------------------------------------------------
+    def __init__(self):
+        """
+        Make an empty map.
+        """
+        
+        self.entries: list[RenameMapEntry] = []
+        """
+        The renames in the order they were recorded.
+        """
+        
+        self._counts: dict[str, int] = {}
+        """
+        Number of renames by type.
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Get number of renames -------------------------------------------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    # Get renames -----------------------------------------------------------------------------------------------------------------
+    def __iter__(self):
+        return iter(self.entries)
+    
+    # Identify an ID --------------------------------------------------------------------------------------------------------------
+    @classmethod
+    def keyOf(cls, item) -> tuple:
+        """
+        Get the (type, library) part of the key identifying the ID in a rename map.
+
+        Args:
+            item (bpy.types.Object or bpy.types.Collection): The ID.
+
+        Returns:
+            A tuple of the type name and the library path (an empty string for local IDs).
+        """
+        
+        return (cls._idTypeOf(item), item.library.filepath if item.library is not None else "")
+    
+    # Record a rename -------------------------------------------------------------------------------------------------------------
+    def add(self, item, oldName: str):
+        """
+        Record that the ID has been (or would be) renamed from `oldName` to its current name.
+
+        Args:
+            item (bpy.types.Object or bpy.types.Collection): The renamed ID.
+            oldName (str): Name of the ID before renaming.
+        """
+        
+        self.addEntry(*self.keyOf(item), oldName, item.name)
+    
+    # Record a rename by names ----------------------------------------------------------------------------------------------------
+    def addEntry(self, idType: str, library: str, oldName: str, newName: str):
+        """
+        Record a rename.
+
+        Args:
+            idType (str): Type of the ID, `OBJECT` or `COLLECTION`.
+            library (str): Path of the library the ID is linked from, or an empty string for local IDs.
+            oldName (str): Name of the ID before renaming.
+            newName (str): Name of the ID after renaming.
+        """
+        
+        self.entries.append(RenameMapEntry(idType, library, oldName, newName))
+        self._counts[idType] = self._counts.get(idType, 0) + 1
+    
+    # Get number of renames of a type ---------------------------------------------------------------------------------------------
+    def countOf(self, idType: str) -> int:
+        """
+        Get the number of renames of the given type.
+
+        Args:
+            idType (str): Type of the ID, `OBJECT` or `COLLECTION`.
+
+        Returns:
+            The number of renames recorded for the type.
+        """
+        
+        return self._counts.get(idType, 0)
+    
+    # Save to file ----------------------------------------------------------------------------------------------------------------
+    def save(self, filePath: str):
+        """
+        Save the map to a file. The format is CSV if the file name ends with `.csv`, JSON otherwise.
+
+        Args:
+            filePath (str): Path of the file to write. Blender-relative paths (starting with `//`) are supported.
+        """
+        
+        filePath = bpy.path.abspath(filePath)
+        
+        if self._isCsv(filePath):
+            with open(filePath, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(self._csvColumns)
+                for e in self.entries:
+                    writer.writerow([e.idType, e.library, e.oldName, e.newName])
+        else:
+            with open(filePath, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": self._formatVersion,
+                    "entries": [dict(zip(self._csvColumns, [e.idType, e.library, e.oldName, e.newName])) for e in self.entries]
+                }, f, indent=2, ensure_ascii=False)
+    
+    # Load from file --------------------------------------------------------------------------------------------------------------
+    @classmethod
+    def load(cls, filePath: str) -> RenameMap:
+        """
+        Load a map saved by `save`.
+
+        Args:
+            filePath (str): Path of the file to read. Blender-relative paths (starting with `//`) are supported.
+
+        Returns:
+            The loaded map.
+
+        Raises:
+            Exception: If the file cannot be read or is malformed.
+        """
+        
+        filePath = bpy.path.abspath(filePath)
+        renameMap = RenameMap()
+        
+        try:
+            with open(filePath, "r", encoding="utf-8", newline="") as f:
+                if cls._isCsv(filePath):
+                    rows = list(csv.DictReader(f))
+                else:
+                    rows = json.load(f)["entries"]
+            
+            for row in rows:
+                renameMap.addEntry(row["type"], row.get("library") or "", row["old"], row["new"])
+        except Exception as ex:
+            raise Exception(f"Cannot load rename map from '{filePath}': {ex}")
+        
+        return renameMap
+    
+    # Plan renames in current file ------------------------------------------------------------------------------------------------
+    def plan(self, includeObjects: bool = True, includeCollections: bool = True) -> list[tuple]:
+        """
+        Find the objects and collections of the current file to rename as specified by the map. Each ID is looked up in
+        a dictionary by its type, library and name, so no matching is performed.
+
+        Args:
+            includeObjects (bool): `True` to rename objects.
+            includeCollections (bool): `True` to rename collections.
+
+        Returns:
+            The list of items to rename and their new names as tuples.
+        """
+        
+        lookup = {(e.idType, e.library, e.oldName): e.newName for e in self.entries}
+        
+        scope = []
+        if includeCollections:
+            scope.append(bpy.data.collections)
+        if includeObjects:
+            scope.append(bpy.data.objects)
+        
+        # Collect first as renaming reorders the data collections
+        planned = []
+        for ids in scope:
+            for item in ids:
+                newName = lookup.get((*self.keyOf(item), item.name))
+                if newName is not None and newName != item.name:
+                    planned.append((item, newName))
+        
+        return planned
+    
+    # Apply to current file -------------------------------------------------------------------------------------------------------
+    def apply(self, includeObjects: bool = True, includeCollections: bool = True, isTestOnly: bool = False, 
+              conflictPolicy: str = 'AUTO_SUFFIX') -> RenameMap:
+        """
+        Rename objects and collections of the current file as specified by the map. Renames are collected by `plan` 
+        and checked for name conflicts before any name is changed, then performed in an order in which no item takes a
+        name still held by another one, just like the operator does. So chained renames (such as `A` to `B` and `B` to
+        `C`) and swaps don't lead to suffixed names.
+
+        Args:
+            includeObjects (bool): `True` to rename objects.
+            includeCollections (bool): `True` to rename collections.
+            isTestOnly (bool): `True` to only list the renames without actually changing anything.
+            conflictPolicy (str): What to do with name conflicts, see `conflicts.ConflictResolver`.
+
+        Returns:
+            The renames applied (or in test mode, the ones that would be applied).
+
+        Raises:
+            Exception: If there are name conflicts and `conflictPolicy` is `ABORT`.
+        """
+        
+        # Import here as the conflicts module depends on this one
+        from . import conflicts
+        
+        resolver = conflicts.ConflictResolver(conflictPolicy)
+        try:
+            plan = resolver.resolve(self.plan(includeObjects=includeObjects, includeCollections=includeCollections))
+        finally:
+            for conflict in resolver.conflicts:
+                print(f"* {conflict}")
+        
+        applied = RenameMap()
+        
+        if isTestOnly:
+            for item, newName in plan:
+                print(f"* '{item.name}' --> '{newName}'")
+                applied.addEntry(*self.keyOf(item), item.name, newName)
+        else:
+            resolver.rename(plan, applied.add)
+        
+        return applied
+    
+    # Apply to several files ------------------------------------------------------------------------------------------------------
+    def applyToFiles(self, filePaths: list[str], includeObjects: bool = True, includeCollections: bool = True, 
+                     conflictPolicy: str = 'AUTO_SUFFIX') -> dict:
+        """
+        Open each file, apply the map and save the file. Use this from a script run by Blender, for example in
+        background mode, as opening a file replaces the data of the current one.
+
+        Args:
+            filePaths (list[str]): Paths of the `.blend` files to process.
+            includeObjects (bool): `True` to rename objects.
+            includeCollections (bool): `True` to rename collections.
+            conflictPolicy (str): What to do with name conflicts, see `conflicts.ConflictResolver`.
+
+        Returns:
+            A dictionary telling the number of renames applied in each file, or `None` for files skipped due to name
+            conflicts when `conflictPolicy` is `ABORT`.
+        """
+        
+        results = {}
+        
+        for filePath in filePaths:
+            bpy.ops.wm.open_mainfile(filepath=filePath)
+            
+            try:
+                applied = self.apply(
+                    includeObjects=includeObjects, includeCollections=includeCollections, conflictPolicy=conflictPolicy)
+            except Exception as ex:
+                # Nothing has been renamed in this file, go on with the others
+                print(f"{filePath}: {ex}")
+                results[filePath] = None
+                continue
+            
+            if len(applied) > 0:
+                bpy.ops.wm.save_mainfile()
+            results[filePath] = len(applied)
+            print(f"{filePath}: renamed {len(applied)} item(s)")
+        
+        return results
+    
+    # Private functions ===========================================================================================================
+    
+    # Tell file format ------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _isCsv(filePath: str) -> bool:
+        return os.path.splitext(filePath)[1].lower() == ".csv"
+    
+    # Get type name of an ID ------------------------------------------------------------------------------------------------------
+    @classmethod
+    def _idTypeOf(cls, item) -> str:
+        """
+        Get the type name of an ID as used in rename maps.
+        """
+        
+        idType = cls.idTypes.get(type(item))
+        if idType is not None:
+            return idType
+        
+        for t, name in cls.idTypes.items():
+            if isinstance(item, t):
+                return name
+        
+        return type(item).__name__.upper()
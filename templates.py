@@ -0,0 +1,282 @@
+# T1nk-R's Unified Rename add-on for Blender
+# - part of T1nk-R Utilities for Blender
+#
+# Version: Please see the version tag under bl_info in __init__.py.
+#
+# This module is responsible for expanding tokens in replacement templates.
+#
+# Module and add-on authored by T1nk-R (https://github.com/gusztavj/)
+#
+# PURPOSE & USAGE *****************************************************************************************************************
+# You can use this add-on to get a single panel to batch rename collections and objects shown in Blender's Outliner
+# using text or regex-based search and replace.
+#
+# Help, support, updates and anything else: https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# COPYRIGHT ***********************************************************************************************************************
+#
+# ** MIT License **
+# 
+# Copyright (c) 2023-2024, T1nk-R (Gusztáv Jánvári)
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, 
+# merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is 
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE 
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, 
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+# 
+# ** Commercial Use **
+# 
+# I would highly appreciate to get notified via [janvari.gusztav@imprestige.biz](mailto:janvari.gusztav@imprestige.biz) about 
+# any such usage. I would be happy to learn this work is of your interest, and to discuss options for commercial support and 
+# other services you may need.
+#
+# DISCLAIMER **********************************************************************************************************************
+# This add-on is provided as-is. Use at your own risk. No warranties, no guarantee, no liability,
+# no matter what happens. Still I tried to make sure no weird things happen:
+#   * This add-on is intended to change the name of your Blender objects and collections matching the criteria you specify.
+#   * This add-on is not intended to modify your objects and other Blender assets in any other way.
+#   * You shall be able to simply undo consequences made by this add-on.
+#
+# You may learn more about legal matters on page https://github.com/gusztavj/T1nkR-Blender-Unified-Rename
+#
+# *********************************************************************************************************************************
+
+from __future__ import annotations
+from string import Formatter
+import bpy
+
+# Index of the collection hierarchy ###############################################################################################
+class HierarchyIndex:
+    """
+    Lookup tables telling which collection owns an object or a collection. The tables are built once per run by walking
+    `bpy.data` in one pass, so that resolving tokens does not query `users_collection` for each item.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    
+    # Initialize object -----------------------------------------------------------------------------------------------------------
+    def __init__(self):
+        """
+        Walk all collections, including the master collections of scenes, and record the owner of each child.
+        """
+        
+        self.owners: dict = {}
+        """
+        Maps objects and collections to the name of the collection they are linked to. If an item is linked to
+        several collections, the first one found wins. Regular collections take precedence over the master collections
+        of scenes.
+        """
+        
+        for collection in bpy.data.collections:
+            self._addChildren(collection)
+        
+        for scene in bpy.data.scenes:
+            self._addChildren(scene.collection)
+    
+    # Public functions ============================================================================================================
+    
+    # Get owner of an item --------------------------------------------------------------------------------------------------------
+    def ownerOf(self, item) -> str:
+        """
+        Get the name of the collection owning the item.
+
+        Args:
+            item (bpy.types.Object or bpy.types.Collection): The item to look up.
+
+        Returns:
+            The name of the owning collection, or an empty string if the item is not linked to any collection.
+        """
+        
+        return self.owners.get(item, "")
+    
+    # Private functions ===========================================================================================================
+    
+    # Record children of a collection ---------------------------------------------------------------------------------------------
+    def _addChildren(self, collection: bpy.types.Collection):
+        """
+        Record the collection as the owner of its direct child collections and objects, unless they already have one.
+
+        Args:
+            collection (bpy.types.Collection): The collection whose children to record.
+        """
+        
+        for child in collection.children:
+            self.owners.setdefault(child, collection.name)
+        
+        for child in collection.objects:
+            self.owners.setdefault(child, collection.name)
+
+# Replacement template ############################################################################################################
+class ReplacementTemplate:
+    """
+    A replacement text with tokens in braces, such as `{collection}_{type}_{index:03}`. Tokens may have a format
+    specification after a colon, as in Python's `str.format`, but no conversion (such as `!r`). Literal braces can be
+    written as `{{` and `}}`.
+    
+    Supported tokens:
+    * `{name}`: the current name of the item.
+    * `{type}`: the type of the object, such as `MESH`, or `COLLECTION` for collections.
+    * `{data}`: the name of the data block of the object, empty for collections and empties.
+    * `{collection}`: the name of the collection the item is linked to.
+    * `{parent}`: the name of the parent object, or if there's none, the name of the owning collection.
+    * `{scene}`: the name of the current scene.
+    * `{index}`: a counter incremented for each item affected by the replacement.
+    
+    Names of collections and parents are the ones they had before the run, even if they are renamed in the same run.
+    """
+    
+    # Properties ==================================================================================================================
+    
+    tokens = ("name", "type", "data", "collection", "parent", "scene", "index")
+    """
+    Names of the tokens that can be used in templates.
+    """
+    
+    _hierarchyTokens = ("collection", "parent")
+    """
+    Tokens requiring the hierarchy index to be built.
+    """
+    
+    # Lifecycle management ========================================================================================================
+    
+    # Initialize object -----------------------------------------------------------------------------------------------------------
+    def __init__(self, template: str, isRegex: bool = False, startIndex: int = 1):
+        """
+        Parse the template once so that it only needs to be filled in for each item.
+
+        Args:
+            template (str): The replacement text with tokens.
+            isRegex (bool): `True` if the expanded text will be used as the replacement of `re.sub`, in which case
+                backslashes in token values are escaped so that they are not taken for backreferences.
+            startIndex (int): The first value of the `{index}` token.
+
+        Raises:
+            Exception: If the template is malformed or contains an unknown token.
+        """
+        
+        self.isRegex = isRegex
+        """
+        Tells if token values shall be escaped for use in `re.sub`.
+        """
+        
+        self.index = startIndex
+        """
+        The value of the `{index}` token for the next item.
+        """
+        
+        self.parts: list = []
+        """
+        The parsed template as a list of (literal text, token name or `None`, format specification) tuples.
+        """
+        
+        try:
+            for literal, token, formatSpec, conversion in Formatter().parse(template):
+                if token is not None and token not in self.tokens:
+                    raise Exception(f"Unknown token '{{{token}}}' in replacement. Use any of: " + \
+                        ", ".join([f"{{{t}}}" for t in self.tokens]))
+                
+                # Conversions such as {name!r} are not supported, and would be silently ignored otherwise
+                if conversion is not None:
+                    raise ValueError(f"conversion '!{conversion}' of token '{{{token}}}' is not supported")
+                
+                # Check the format specification now rather than failing on the first item
+                if token is not None and formatSpec:
+                    format(0 if token == "index" else "", formatSpec)
+                
+                self.parts.append((literal, token, formatSpec or ""))
+        except ValueError as ex:
+            raise Exception(f"Malformed replacement template: {ex}")
+        
+        self.hierarchy: HierarchyIndex = None
+        """
+        Index of the collection hierarchy, only built if the template refers to collections.
+        """
+        
+        if any(token in self._hierarchyTokens for _, token, _ in self.parts):
+            self.hierarchy = HierarchyIndex()
+        
+        self.sceneName = bpy.context.scene.name if bpy.context.scene is not None else ""
+        """
+        Name of the current scene, looked up once per run.
+        """
+    
+    # Public functions ============================================================================================================
+    
+    # Fill in the template for an item --------------------------------------------------------------------------------------------
+    def expand(self, item) -> str:
+        """
+        Fill in the tokens for the item and advance the counter.
+
+        Args:
+            item (bpy.types.Object or bpy.types.Collection): The item being renamed.
+
+        Returns:
+            The replacement text for the item.
+        """
+        
+        result = []
+        
+        for literal, token, formatSpec in self.parts:
+            result.append(literal)
+            
+            if token is None:
+                continue
+            
+            value = self._tokenValue(token, item)
+            value = format(value, formatSpec)
+            
+            if self.isRegex:
+                value = value.replace("\\", "\\\\")
+            
+            result.append(value)
+        
+        self.index = self.index + 1
+        
+        return "".join(result)
+    
+    # Private functions ===========================================================================================================
+    
+    # Resolve a single token ------------------------------------------------------------------------------------------------------
+    def _tokenValue(self, token: str, item):
+        """
+        Get the value of a token for the item.
+
+        Args:
+            token (str): Name of the token.
+            item (bpy.types.Object or bpy.types.Collection): The item being renamed.
+
+        Returns:
+            The value of the token, a number for `{index}` and a string for all others.
+        """
+        
+        isObject = isinstance(item, bpy.types.Object)
+        
+        if token == "name":
+            return item.name
+        
+        if token == "type":
+            return item.type if isObject else "COLLECTION"
+        
+        if token == "data":
+            return item.data.name if isObject and item.data is not None else ""
+        
+        if token == "collection":
+            return self.hierarchy.ownerOf(item)
+        
+        if token == "parent":
+            if isObject and item.parent is not None:
+                return item.parent.name
+            return self.hierarchy.ownerOf(item)
+        
+        if token == "scene":
+            return self.sceneName
+        
+        # Only index is left
+        return self.index
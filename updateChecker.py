@@ -48,10 +48,9 @@
 #
 # *********************************************************************************************************************************
 
-from __future__ import annotations
 from . import bl_info
+from . import releaseCheck
 import requests
-import re
 from datetime import datetime
 from bpy.types import PropertyGroup, Operator, Context
 from bpy.props import StringProperty, BoolProperty, IntProperty
@@ -139,6 +138,49 @@ class T1nkerUnifiedRenameUpdateInfo(PropertyGroup):
     """
     Date and time of last successful check for updates.
     """
+    
+    etag: StringProperty(
+        name="ETag of the latest release information",
+        default=""
+    )
+    """
+    The `ETag` header of the last successful response, sent back in `If-None-Match` so that the server can tell
+    if the release information has not changed.
+    """
+    
+    lastModified: StringProperty(
+        name="Last modification time of the latest release information",
+        default=""
+    )
+    """
+    The `Last-Modified` header of the last successful response, sent back in `If-Modified-Since` so that the server can 
+    tell if the release information has not changed.
+    """
+    
+    lastFailedTimestamp: StringProperty(
+        name="When last failed check for updates happened",
+        default=""
+    )
+    """
+    Date and time of the last failed check for updates, empty if the last check succeeded.
+    """
+    
+    failureCount: IntProperty(
+        name="Number of failed checks for updates in a row",
+        default=0
+    )
+    """
+    Number of consecutive failed checks for updates, used to wait exponentially longer before retrying.
+    """
+    
+    offlineMode: BoolProperty(
+        name="Don't check for updates",
+        description="Never connect to the internet to check for updates, for example when working offline",
+        default=False
+    )
+    """
+    If checked (`True`), no update checks are performed.
+    """
         
 # Operator for checking updates ###################################################################################################
 class T1NKER_OT_UnifiedRenameUpdateChecker(Operator):    
@@ -169,11 +211,11 @@ class T1NKER_OT_UnifiedRenameUpdateChecker(Operator):
         """
         Performs update check for the add-on and caches results. The cache expires in some days as specified in
         `updateInfo.T1nkerUnifiedRenameUpdateInfo.checkFrequencyDays`, and then new check is performed. Until that the
-        cached information is served.
+        cached information is served. The server is asked to send release information only if it has changed since
+        the last check. After a failed check, retries are delayed exponentially. No check is performed in offline mode.
 
         Args:
             context (bpy.types.Context): A context object passed on by Blender for the current context.
-            event: The event triggering the operation, as passed on by Blender.
 
         Returns:
             {'FINISHED'} or {'ERROR'}, indicating success or failure of the operation.
@@ -181,57 +223,90 @@ class T1NKER_OT_UnifiedRenameUpdateChecker(Operator):
                 
         updateInfo = context.preferences.addons[__package__].preferences.updateInfo
         
-        # Check cache expiry only if update check is not forced
+        # Don't touch the network at all when working offline
+        if updateInfo.offlineMode:
+            return {'FINISHED'}
+        
+        now = datetime.now()
+        
+        # Check cache expiry and backoff only if update check is not forced
         if not self.forceUpdateCheck:                    
-            # Check if update check shall be performed based on frequency
-            try:                        
-                lastCheckDate = datetime.strptime(updateInfo.lastCheckedTimestamp, '%Y-%m-%d %H:%M:%S')
-                delta = datetime.now() - lastCheckDate
-                if delta.days < updateInfo.checkFrequencyDays: # Successfully checked for updates in the last checkFrequencyDays number of days
-                    # Do not flood the repo API, use cached info
-                    return
-            except: # For example, lastCheck is None as no update check was ever performed yet
-                # Could not determine when last update check was performed, do nothing (check it now)
-                pass
+            if not releaseCheck.isCheckDue(updateInfo, now):
+                return {'FINISHED'}
         else: # turn forcing check off to prevent accidental flooding                
             self.forceUpdateCheck = False
         
         try: # if anything goes wrong we silently fail, no need to perform double-checks
-            response = requests.get(RepoInfo.repoReleaseApiUrl, timeout=5, auth=(RepoInfo.username, RepoInfo.token))            
-        
-            updateInfo.latestVersionName = response.json()["name"]
-            updateInfo.latestVersion = response.json()["tag_name"]
-            
-            # Trim leading v and eventual trailing qualifiers such as -alpha
-            latestVersionCleaned = re.match("[v]((\d+\.)*(\d+)).*", updateInfo.latestVersion)[1]
+            # Only ask for changes if there's cached release information to fall back on
+            hasCachedRelease = updateInfo.latestVersion != ""
             
-            # Parse into a list
-            latestVersionTags = [int(t) for t in latestVersionCleaned.split(".")]
+            release, updateInfo.etag, updateInfo.lastModified = releaseCheck.fetchLatestRelease(
+                RepoInfo.repoReleaseApiUrl, 
+                etag=updateInfo.etag if hasCachedRelease else "", 
+                lastModified=updateInfo.lastModified if hasCachedRelease else "", 
+                auth=(RepoInfo.username, RepoInfo.token))
             
-            # Get installed version (already stored as a list by Blender)
-            installedVersionTags = bl_info["version"]
-            updateInfo.currentVersion = ".".join([str(i) for i in installedVersionTags])
-            
-            updateInfo.updateAvailable = False
-            
-            if latestVersionTags[0] > installedVersionTags[0]:
-                updateInfo.updateAvailable = True
+            # If nothing has changed since the last check, the cached release is still the latest, but the installed
+            # version may have changed since then, so compare again
+            if release is not None:
+                self._processRelease(updateInfo, release)
             else:
-                if latestVersionTags[1] > installedVersionTags[1]:
-                    updateInfo.updateAvailable = True
-                else:
-                    if len(installedVersionTags) > 2 and latestVersionTags[2] > installedVersionTags[2]:
-                        updateInfo.updateAvailable = True
+                self._compareVersions(updateInfo)
                         
             # Save timestamp
-            updateInfo.lastCheckedTimestamp = f"{datetime.strftime(datetime.now(), '%Y-%m-%d %H:%M:%S')}"
+            updateInfo.lastCheckedTimestamp = releaseCheck.formatTimestamp(now)
+            updateInfo.lastFailedTimestamp = ""
+            updateInfo.failureCount = 0
             
-        except requests.exceptions.Timeout as tex:
-            # Timeout, let's not bother the user
-            print("Version checking timed out")
-            updateInfo.updateAvailable = False
         except Exception as ex: 
-            print(f"Error during version check: {ex}")
+            if isinstance(ex, requests.exceptions.Timeout):
+                # Timeout, let's not bother the user
+                print("Version checking timed out")
+            else:
+                print(f"Error during version check: {ex}")
+            
             updateInfo.updateAvailable = False
+            
+            # Don't trust the validators, the cached release information may be incomplete
+            updateInfo.etag = ""
+            updateInfo.lastModified = ""
+            
+            # Record the failure so that we don't retry (and wait for the timeout) at each run
+            updateInfo.lastFailedTimestamp = releaseCheck.formatTimestamp(now)
+            updateInfo.failureCount = updateInfo.failureCount + 1
                 
-        return {'FINISHED'}
\ No newline at end of file
+        return {'FINISHED'}
+    
+    # Private functions ===========================================================================================================
+    
+    # Process release information -------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _processRelease(updateInfo: T1nkerUnifiedRenameUpdateInfo, release: dict):
+        """
+        Store the latest release information and determine whether it's newer than the installed version.
+
+        Args:
+            updateInfo (T1nkerUnifiedRenameUpdateInfo): The update information to update.
+            release (dict): The release information as parsed from the response of the API.
+        """
+        
+        updateInfo.latestVersionName = release["name"]
+        updateInfo.latestVersion = release["tag_name"]
+        
+        T1NKER_OT_UnifiedRenameUpdateChecker._compareVersions(updateInfo)
+    
+    # Compare cached release with installed version -------------------------------------------------------------------------------
+    @staticmethod
+    def _compareVersions(updateInfo: T1nkerUnifiedRenameUpdateInfo):
+        """
+        Determine whether the latest release stored in the update information is newer than the installed version.
+
+        Args:
+            updateInfo (T1nkerUnifiedRenameUpdateInfo): The update information to update.
+        """
+        
+        # Get installed version (already stored as a list by Blender)
+        installedVersionTags = bl_info["version"]
+        updateInfo.currentVersion = ".".join([str(i) for i in installedVersionTags])
+        
+        updateInfo.updateAvailable = releaseCheck.isNewerVersion(updateInfo.latestVersion, installedVersionTags)